@@ -1,45 +1,80 @@
 """
 Main pipeline script to generate all figures for the project.
 
-This script sequentially executes each figure script in src/ and
-saves all outputs to the figures/ directory.
+This script concurrently runs the make_figures() function of each figure
+script in scripts/ and saves all outputs to the figures/ directory.
 """
 
+import importlib
+import multiprocessing
 import os
-import subprocess
-import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-SCR_DIR = os.path.join(os.path.dirname(__file__), 'scripts')
+from utils import config
 
 # List all the figure scripts to run, in desired order
 FIG_SCRIPTS = [
-    "fig_1B.py",
-    "fig_3E.py",
-    "fig_4E.py",
-    "fig_5E.py",
-    "fig_6BD.py",
-    "fig_8.py",
-    "fig_9B.py",
-    "fig_S3.py",
-    "fig_S4.py",
-    "fig_S6B.py",
-    "fig_S7BE.py",
+    "fig_1B",
+    "fig_3E",
+    "fig_4E",
+    "fig_5E",
+    "fig_6BD",
+    "fig_8",
+    "fig_9B",
+    "fig_S3",
+    "fig_S4",
+    "fig_S6B",
+    "fig_S7BE",
 ]
 
-def run_script(script):
-    script_path = os.path.join(SCR_DIR, script)
-    print(f"\n--- Running {script} ---")
+# Third-party modules imported once by the worker server. VTK-backed modules
+# (brainspace, surfplot) are left out, so no process is forked with VTK state
+PRELOAD_MODULES = [
+    "numpy",
+    "pandas",
+    "scipy.stats",
+    "matplotlib.pyplot",
+    "seaborn",
+    "nibabel",
+]
 
-    result = subprocess.run([sys.executable, script_path], cwd=os.path.dirname(__file__))
-    if result.returncode != 0:
-        print(f"Error: {script} exited with code {result.returncode}")
-    else:
-        print(f"Done: {script}")
+def make_figures(script, stat_map_workers):
+    config.STAT_MAP_WORKERS = stat_map_workers
+    importlib.import_module(f'scripts.{script}').make_figures()
+
+def run_script(script, ctx, stat_map_workers):
+    print(f"--- Running {script} ---")
+    # a separate process per script keeps their state (and crashes) isolated
+    process = ctx.Process(target=make_figures, args=(script, stat_map_workers))
+    process.start()
+    process.join()
+    return process.exitcode
 
 def main():
     print("=== Generating Figuers ===")
-    for script in FIG_SCRIPTS:
-        run_script(script)
+    # script processes are forked from a server that has already imported
+    # the heavy dependencies, instead of each starting a new interpreter
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('forkserver')
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+    else:
+        ctx = multiprocessing.get_context('spawn')
+
+    n_workers = min(len(FIG_SCRIPTS), os.cpu_count() or 1)
+    # the scripts already run concurrently, so their stat-map renderers split 
+    # the CPUs between them rather than each using all of them
+    stat_map_workers = max(1, (os.cpu_count() or 1) // n_workers)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = {}
+        for script in FIG_SCRIPTS:
+            futures[executor.submit(run_script, script, ctx, stat_map_workers)] = script
+        for future in as_completed(futures):
+            script = futures[future]
+            exitcode = future.result()
+            if exitcode != 0:
+                print(f"Error: {script} exited with code {exitcode}")
+            else:
+                print(f"Done: {script}")
     print("\nAll figures generated! See the 'figures/' directory.")
 
 if __name__ == "__main__":
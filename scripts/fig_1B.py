@@ -10,18 +10,19 @@ This script:
 import os
 import sys
 import numpy as np
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib import ticker, gridspec
 import seaborn as sns
-import pingouin as pg
+from scipy import stats
 
 # Ensure project root is in sys.path for absolute imports
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from utils.config import FIG_DIR, DATA_DIR
+from utils.config import FIG_DIR, load_workbook
 os.makedirs(FIG_DIR, exist_ok=True)
 
 def plot_task_behaviour_binned(data, trial_block_length = 8,
@@ -40,15 +41,14 @@ def plot_task_behaviour_binned(data, trial_block_length = 8,
     """
     epochs = {1: 'LH Baseline', 2: 'RH Baseline', 3: 'RH Learning', 5: 'Report', 6: 'LH Learning'}
     # Plot setup
-    unique_blocks = sorted(data['BlockNo'].unique())
+    by_block = dict(list(data.groupby('BlockNo', sort=True)))
+    unique_blocks = list(by_block)
     ncols = len(unique_blocks)
     first_subject = data['SubNo'].unique()[0]
     
-    width_ratios = [
-        len(data[(data['BlockNo'] == b) & (data['SubNo'] == first_subject)]) / 64
-        for b in unique_blocks
-    ]
-
+    # Trials per block of one subject, counted in a single pass
+    block_counts = data.loc[data['SubNo'] == first_subject, 'BlockNo'].value_counts()
+    width_ratios = (block_counts.reindex(unique_blocks, fill_value=0) / 64).tolist()
     
     fig = plt.figure(figsize=(16, 4))
     spec = gridspec.GridSpec(
@@ -57,17 +57,20 @@ def plot_task_behaviour_binned(data, trial_block_length = 8,
     )
     
     for i, block in enumerate(unique_blocks):
-        block_data = data.query('BlockNo == @block')
+        block_data = by_block[block]
         trial_blocks = block_data['TrialBlock'].unique()
         color = 'orange' if np.isin([1, 6], block).any() else 'green'
         
         ax = fig.add_subplot(spec[i])
-        sns.lineplot(
-            x='TrialBlock', y='AngularError', data=block_data,
-            errorbar=('ci', 95), color=color, ax=ax, zorder=3
+        # Group mean with a t-based 95% CI across subjects
+        summary = block_data.groupby('TrialBlock')['AngularError'].agg(['mean', 'sem', 'count'])
+        half_width = summary['sem'] * stats.t.ppf(0.975, summary['count'] - 1)
+        ax.plot(summary.index, summary['mean'], color=color, zorder=3)
+        ax.fill_between(
+            summary.index, summary['mean'] - half_width, summary['mean'] + half_width,
+            color=color, alpha=0.25, linewidth=0, zorder=3
         )
         
-        plt.setp(ax.collections[0], alpha=0.25)
         ax.set(
             xticks=[trial_blocks.max()],
             yticks=np.arange(-15, 60, 15)
@@ -90,6 +93,7 @@ def plot_task_behaviour_binned(data, trial_block_length = 8,
         ax.set_title(epochs[block])
 
     fig.savefig(os.path.join(FIG_DIR, fig_name), dpi=300)
+    plt.close(fig)
 
 def plot_early_error_change(early_error, fig_name='1B_task_RH-LH_early_error.png'):
     """
@@ -107,21 +111,21 @@ def plot_early_error_change(early_error, fig_name='1B_task_RH-LH_early_error.png
     labels = ["RH Learning\n Early", "LH Transfer\n Early"]
     palette = ["orange", "green"]
 
-    # Paired test (Pingouin)
-    res = pg.pairwise_tests(
-        data=early_error,
-        dv='AngularError',
-        within='Epoch',
-        subject='SubNo'
-    )
-    if res.loc[0, "p-unc"] <= .01:
+    # Paired t-test across subjects
+    wide = early_error.pivot(index='SubNo', columns='Epoch', values='AngularError')
+    _, pval = stats.ttest_rel(wide[epoch_order[0]], wide[epoch_order[1]])
+    if pval <= .01:
         pval_asterisks = '**'
+    elif pval <= .05:
+        pval_asterisks = '*'
+    else:
+        pval_asterisks = 'ns'
 
     # Plot
     fig, ax = plt.subplots(figsize=(2.5, 6))
     sns.barplot(
         data=early_error, x='Epoch', y='AngularError', hue='Epoch',
-        order=epoch_order, palette=palette, ax=ax, width=0.7
+        order=epoch_order, palette=palette, ax=ax, width=0.7, seed=0
     )
 
     # Draw a line for significance and place asterisks above bars
@@ -137,13 +141,14 @@ def plot_early_error_change(early_error, fig_name='1B_task_RH-LH_early_error.png
     plt.tight_layout()
     
     fig.savefig(os.path.join(FIG_DIR, fig_name), dpi=300)
+    plt.close(fig)
 
-def main():
+def make_figures():
 
-    data = pd.read_excel(os.path.join(DATA_DIR, '1B_data.xlsx'), sheet_name=None)
+    data = load_workbook('1B_data')
 
     plot_task_behaviour_binned(data['binned_learning_curve'])
     plot_early_error_change(data['rh_vs_lh_early_error'])
     
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    make_figures()
\ No newline at end of file
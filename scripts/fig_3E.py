@@ -9,7 +9,8 @@ This script:
 import os
 import sys
 import numpy as np
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -18,7 +19,7 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from utils.config import FIG_DIR, DATA_DIR
+from utils.config import FIG_DIR, load_workbook
 os.makedirs(FIG_DIR, exist_ok=True)
 
 def plot_rsa_model_comparisons(data, fig_name='3E_rsa_models_comparison.png'):
@@ -34,6 +35,7 @@ def plot_rsa_model_comparisons(data, fig_name='3E_rsa_models_comparison.png'):
     """
     # Extract relevant data
     boot_df = data['evaluations']
+    boot = boot_df.to_numpy()
     pvals_zero = data['models_summary']['p_0'].values
     pvals_nc = data['models_summary']['p_NC'].values
     pairwise_qvals = data['models_comparison_fdr'].iloc[:, 1:].values
@@ -41,8 +43,8 @@ def plot_rsa_model_comparisons(data, fig_name='3E_rsa_models_comparison.png'):
     # Plot settings
     colors = ['green', 'orange', 'blue', 'red']
     n_models = len(model_names)
-    means = boot_df.mean(axis=0)
-    sems = boot_df.std(axis=0)
+    means = boot.mean(axis=0)
+    sems = boot.std(axis=0, ddof=1)
 
 
     x = np.arange(len(model_names))
@@ -60,27 +62,28 @@ def plot_rsa_model_comparisons(data, fig_name='3E_rsa_models_comparison.png'):
             ax.plot(x[i], 1, marker="v", markersize=8, color="lightgray", markeredgecolor="k", zorder=10)
     
     # Pairwise significant comparisons (FDR corrected)
-    k = 1
-    for i in range(n_models):
-        for j in range(i+1, n_models):
-            if pairwise_qvals[i, j] < 0.05:
-                y = 1 - .06 * k
-                ax.plot([x[i], x[j]], [y, y], color='k', linewidth=1.5)
-                ax.text((x[i]+x[j])/2, y, '**', ha='center', va='bottom', fontsize=12)
-                k += 1
+    rows, cols = np.triu_indices(n_models, k=1)
+    sig_pairs = np.flatnonzero(pairwise_qvals[rows, cols] < 0.05)
+    for k, pair in enumerate(sig_pairs, start=1):
+        i, j = rows[pair], cols[pair]
+        y = 1 - .06 * k
+        ax.plot([x[i], x[j]], [y, y], color='k', linewidth=1.5)
+        ax.text((x[i]+x[j])/2, y, '**', ha='center', va='bottom', fontsize=12)
     
     ax.set_xticks(x)
     ax.set_xticklabels(model_names)
     ax.set_ylabel("Cosine Similarity")
     plt.tight_layout()
-    sns.despine()
+    sns.despine(ax=ax)
     fig.savefig(os.path.join(FIG_DIR, fig_name), dpi=300)
+    plt.close(fig)
     return
-def main():
+def make_figures():
 
-    data = pd.read_excel(os.path.join(DATA_DIR, '3E_data.xlsx'), sheet_name=None)
+    sheets = ['evaluations', 'models_summary', 'models_comparison_fdr']
+    data = load_workbook('3E_data', sheet_name=sheets)
 
     plot_rsa_model_comparisons(data)
     
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    make_figures()
\ No newline at end of file
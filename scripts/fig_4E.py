@@ -10,7 +10,8 @@ This script:
 import os
 import sys
 import numpy as np
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -20,7 +21,8 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from utils import plotting
-from utils.config import FIG_DIR, DATA_DIR
+from utils.config import FIG_DIR, load_workbook
+from utils.epochs import EPOCH_COLORS, EPOCH_DTYPE, EPOCH_LABELS
 os.makedirs(FIG_DIR, exist_ok=True)
     
 def plot_hand_effect(data, prefix='4E_'):
@@ -55,25 +57,14 @@ def plot_sig_region_eccentricity(ecc, fig_name='4E_hand_effect_sig-regions_ecc.p
     fig_name : str
         Name of the figure file to save.
     """
-    # Epoch ordering and color palette
-    epoch_color_map = {
-        'leftbaseline': 'orange',
-        'rightbaseline': 'green',
-        'rightlearning-early': 'green',
-        'rightlearning-late': 'green',
-        'lefttransfer-early': 'orange',
-        'lefttransfer-late': 'orange'
-    }
-    cmap = list(epoch_color_map.values())
+    cmap = list(EPOCH_COLORS.values())
     fig, axs = plt.subplots(1, 2, figsize=(6, 3.5))
     
+    hemis = dict(list(ecc.groupby('hemi', sort=False)))
     for ax, hemi in zip(axs, ['LH', 'RH']):
-        data = ecc.query('hemi == @hemi').copy()
-        data = data.groupby(['sub', 'epoch']).mean(numeric_only=True).reset_index()
-        epoch_order = list(epoch_color_map.keys())
-        data['epoch'] = pd.Categorical(data['epoch'], categories=epoch_order, ordered=True)
-        data.sort_values('epoch', inplace=True)
-        data.reset_index(drop=True, inplace=True)
+        data = hemis[hemi]
+        data = data.groupby(['sub', 'epoch'], as_index=False)['distance'].mean()
+        data = data.astype({'epoch': EPOCH_DTYPE}).sort_values('epoch', ignore_index=True)
         sns.lineplot(data=data, x='epoch', y='distance', errorbar=None, 
                      marker='o', ms=6, lw=1.2, mfc='w', mec='k', color='k', ax=ax)
         sns.stripplot(data=data, x='epoch', y='distance', jitter=.1, 
@@ -82,13 +73,9 @@ def plot_sig_region_eccentricity(ecc, fig_name='4E_hand_effect_sig-regions_ecc.p
 
         ticks = [0, 1, 2, 3, 4, 5]
         ax.set_xticks(ticks)
-        
-        # Set the tick labels with rotation and fontsize
-        labels = ['LH Baseline', 'RH Baseline', 'RH Learning Early',
-                  'RH Learning Late', 'LH Transfer Early', 'LH Transfer Late']
-        ax.set_xticklabels(labels, rotation=90, fontsize=14)
+        ax.set_xticklabels(EPOCH_LABELS, rotation=90, fontsize=14)
         ax.set_yticks(np.arange(1, 4).astype(int))
-        sns.despine()
+        sns.despine(ax=ax)
 
     axs[0].set_ylabel('Eccentricity', fontsize=14, fontweight='bold')
     axs[1].set_ylabel('')
@@ -96,10 +83,11 @@ def plot_sig_region_eccentricity(ecc, fig_name='4E_hand_effect_sig-regions_ecc.p
     axs[1].set_title('Right Hemisphere', fontsize=14)
 
     fig.savefig(os.path.join(FIG_DIR, fig_name), dpi=300)
+    plt.close(fig)
 
-def main():
+def make_figures():
 
-    data = pd.read_excel(os.path.join(DATA_DIR, '4E_data.xlsx'), sheet_name=None)
+    data = load_workbook('4E_data')
 
     plot_hand_effect(data['hand_effect_right_vs_left'])
 
@@ -107,4 +95,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    make_figures()
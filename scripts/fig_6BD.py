@@ -11,6 +11,8 @@ import os
 import sys
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -19,7 +21,7 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from utils.config import FIG_DIR, DATA_DIR
+from utils.config import FIG_DIR, load_workbook
 os.makedirs(FIG_DIR, exist_ok=True)
 
 def plot_reexpression(ecc_data, posthoc, ax=None):
@@ -62,10 +64,12 @@ def plot_reexpression(ecc_data, posthoc, ax=None):
     if posthoc is not None and not posthoc.empty:
         sig_results = posthoc[posthoc['p-unc'] < 0.05]
         epoch_to_x = {epoch: i for i, epoch in enumerate(epoch_order)}
-        y_max = ecc_data['distance'].max()
-        y_offset = 0.1 * (ecc_data['distance'].max() - ecc_data['distance'].min() + 1e-6)
-        for i, (epoch_a, epoch_b, p_value) in enumerate(sig_results[['A', 'B', 'p-unc']].values):
-            x1, x2 = epoch_to_x[epoch_a], epoch_to_x[epoch_b]
+        x1_arr = sig_results['A'].map(epoch_to_x).to_numpy()
+        x2_arr = sig_results['B'].map(epoch_to_x).to_numpy()
+        p_arr = sig_results['p-unc'].to_numpy()
+        y_max, y_min = ecc_data['distance'].max(), ecc_data['distance'].min()
+        y_offset = 0.1 * (y_max - y_min + 1e-6)
+        for i, (x1, x2, p_value) in enumerate(zip(x1_arr, x2_arr, p_arr)):
             y_pos = y_max + (i + 1) * y_offset
             sig_label = '*' if p_value < 0.05 else ''
             ax.plot([x1, x2], [y_pos, y_pos], color='black', linewidth=1.5)
@@ -81,9 +85,9 @@ def plot_reexpression(ecc_data, posthoc, ax=None):
 
     return ax
 
-def main():
+def make_figures():
 
-    data = pd.read_excel(os.path.join(DATA_DIR, '6BD_data.xlsx'), sheet_name=None)
+    data = load_workbook('6BD_data')
     
     fig, axs = plt.subplots(1, 2, figsize=(4.5, 6))
     
@@ -100,6 +104,7 @@ def main():
     plt.tight_layout()
     
     fig.savefig(os.path.join(FIG_DIR, '6BD_task_epoch_hand_reexpression.png'), dpi=300)
+    plt.close(fig)
     
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    make_figures()
\ No newline at end of file
@@ -9,6 +9,9 @@ This script:
 import os
 import sys
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
 import seaborn as sns
 
 # Ensure project root is in sys.path for absolute imports
@@ -16,7 +19,8 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from utils.config import FIG_DIR, DATA_DIR
+from utils.config import FIG_DIR, load_workbook
+from utils.epochs import EPOCH_COLORS, EPOCH_DTYPE, EPOCH_LABELS
 os.makedirs(FIG_DIR, exist_ok=True)
 
 def plot_seed_eccentricity(ecc_data, fig_name='8_seeds_eccentricity.png'):
@@ -36,23 +40,10 @@ def plot_seed_eccentricity(ecc_data, fig_name='8_seeds_eccentricity.png'):
     plot of eccentricity pattern and mean eccentricity for input seeds.
 
     '''
-    # Epoch ordering and color palette
-    epoch_color_map = {
-        'leftbaseline': 'orange',
-        'rightbaseline': 'green',
-        'rightlearning-early': 'green',
-        'rightlearning-late': 'green',
-        'lefttransfer-early': 'orange',
-        'lefttransfer-late': 'orange'
-    }
-    ecc_data = pd.concat(ecc_data, names=['seed']).reset_index().drop(columns=['level_1', 'roi'])
-    epoch_order = list(epoch_color_map.keys())
-    labels = ['LH Baseline', 'RH Baseline', 'RH Learning Early',
-              'RH Learning Late', 'LH Transfer Early', 'LH Transfer Late']
-    cmap = list(epoch_color_map.values())
-    ecc_data['epoch'] = pd.Categorical(ecc_data['epoch'], categories=epoch_order, ordered=True)
-    ecc_data.sort_values('epoch', inplace=True)
-    ecc_data.reset_index(drop=True, inplace=True)
+    parts = [df.drop(columns=['roi']).assign(seed=seed) for seed, df in ecc_data.items()]
+    ecc_data = pd.concat(parts, ignore_index=True)
+    cmap = list(EPOCH_COLORS.values())
+    ecc_data = ecc_data.astype({'epoch': EPOCH_DTYPE}).sort_values('epoch', ignore_index=True)
     g = sns.FacetGrid(data=ecc_data, col_wrap=2, col='seed',
                       height=2.5, sharey=False,
                       col_order=['Left M1', 'Right M1', 'Left mPFC', 'Right mPFC'])
@@ -61,16 +52,17 @@ def plot_seed_eccentricity(ecc_data, fig_name='8_seeds_eccentricity.png'):
     g.map_dataframe(sns.stripplot, x='epoch', y='distance', jitter=.1, 
                     zorder=-1, s=4, alpha=.5, palette=cmap, hue='epoch')
     g.set_axis_labels('', "Eccentricity")
-    g.set_xticklabels(labels, rotation=90)
+    g.set_xticklabels(EPOCH_LABELS, rotation=90)
     for ax, title in zip(g.axes.flat, g.col_names):
         ax.set_title(title.replace('roi = ', ''))
     g.savefig(os.path.join(FIG_DIR, fig_name), dpi=300)
+    plt.close(g.figure)
     
-def main():
+def make_figures():
 
-    data = pd.read_excel(os.path.join(DATA_DIR, '8_data.xlsx'), sheet_name=None)
+    data = load_workbook('8_data')
 
     plot_seed_eccentricity(data)
     
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    make_figures()
\ No newline at end of file
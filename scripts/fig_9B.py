@@ -9,8 +9,10 @@ This script:
 import os
 import sys
 import numpy as np
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib import cbook
 import seaborn as sns
 
 # Ensure project root is in sys.path for absolute imports
@@ -18,19 +20,21 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from utils.config import FIG_DIR, DATA_DIR
+from utils.config import FIG_DIR, load_workbook
 os.makedirs(FIG_DIR, exist_ok=True)
 
-def plot_distribution(df, angle, ax):
+def plot_distribution(values, box_stats, jitter, ax):
     """
-    Plot the distribution of a specified angle variable as a boxplot with overlaid scatter for individual values.
+    Plot the distribution of an angle variable as a boxplot with overlaid scatter for individual values.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        DataFrame containing subject and angle data.
-    angle : str
-        Name of the column in df corresponding to the angle to plot.
+    values : np.ndarray
+        Angle values, one per subject.
+    box_stats : dict
+        Boxplot statistics of `values`, as returned by matplotlib.cbook.boxplot_stats.
+    jitter : np.ndarray
+        Horizontal offset of each scatter point, same length as `values`.
     ax : matplotlib.axes.Axes
         The axes on which to plot.
 
@@ -39,38 +43,40 @@ def plot_distribution(df, angle, ax):
     ax : matplotlib.axes.Axes
         The axes with the plot.
     """
-    plot_df = df.copy()
-    plot_df['x'] = 1
     box_line_color = 'k'
-    sns.boxplot(x='x', y=angle, data=plot_df, color='silver', 
-                boxprops=dict(edgecolor=box_line_color), 
-                medianprops=dict(color=box_line_color),
-                whiskerprops=dict(color=box_line_color),
-                capprops=dict(color=box_line_color),
-                showfliers=False, width=.5, ax=ax)
+    ax.bxp([box_stats], positions=[0], widths=.5, capwidths=.25,
+           patch_artist=True, showfliers=False, manage_ticks=False,
+           boxprops=dict(facecolor='silver', edgecolor=box_line_color),
+           medianprops=dict(color=box_line_color),
+           whiskerprops=dict(color=box_line_color),
+           capprops=dict(color=box_line_color))
     
-    np.random.seed(1)
-    jitter = np.random.uniform(.01, .4, len(plot_df['x']))
-    ax.scatter(x=plot_df['x'] + jitter , y=plot_df[angle], 
+    ax.scatter(x=1 + jitter, y=values, 
                c='k', ec='k', linewidths=1, s=10,
                clip_on=False)
 
     ax.set(xticks=[], 
            yticks=np.arange(-15, 60, 15))
-    sns.despine(bottom=True)
+    sns.despine(ax=ax, bottom=True)
     return ax
 
-def main():
+def make_figures():
 
-    data = pd.read_excel(os.path.join(DATA_DIR, '9B_data.xlsx'))
+    data = load_workbook('9B_data', sheet_name=0)
     
     fig, axs = plt.subplots(1, 3, figsize=(6, 4))
     angle_names = ['RH Early', 'LH Early', 'Transfer']
     titles = ['RH', 'LH', '']
     ylabels = ['Early Error (°)', 'Early Error (°)', 'Transfer (°)']
 
-    for i, (ax, angle, title, ylabel) in enumerate(zip(axs, angle_names, titles, ylabels)):
-        plot_distribution(data[['sub', angle]], angle, ax)
+    # Box statistics and scatter jitter for all three panels at once
+    values = data[angle_names].to_numpy()
+    box_stats = cbook.boxplot_stats(values)
+    rng = np.random.default_rng(1)
+    jitter = rng.uniform(.01, .4, values.shape)
+
+    for i, (ax, title, ylabel) in enumerate(zip(axs, titles, ylabels)):
+        plot_distribution(values[:, i], box_stats[i], jitter[:, i], ax)
         ax.axhline(0, lw=1, c='k', ls='--')
         ax.set_title(title, fontsize=18)
         ax.set(xlabel='', ylabel=ylabel)
@@ -78,6 +84,7 @@ def main():
     plt.subplots_adjust(wspace=1.3)
     
     fig.savefig(os.path.join(FIG_DIR, '9B_behaviour_distributions.png'), dpi=300)
+    plt.close(fig)
     
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    make_figures()
\ No newline at end of file
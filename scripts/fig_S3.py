@@ -9,7 +9,8 @@ This script:
 import os
 import sys
 import numpy as np
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -18,7 +19,8 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from utils.config import FIG_DIR, DATA_DIR
+from utils.config import FIG_DIR, load_workbook
+from utils.epochs import EPOCH_COLORS, EPOCH_DTYPE, EPOCH_LABELS
 os.makedirs(FIG_DIR, exist_ok=True)
     
 def plot_sig_region_eccentricity(ecc, fig_name='S3_task_epoch-hand_effect_sig_regions_ecc.png'):
@@ -33,21 +35,10 @@ def plot_sig_region_eccentricity(ecc, fig_name='S3_task_epoch-hand_effect_sig_re
         Output file name for the saved figure.
 
     """
-    epoch_color_map = {
-        'leftbaseline': 'orange',
-        'rightbaseline': 'green',
-        'rightlearning-early': 'green',
-        'rightlearning-late': 'green',
-        'lefttransfer-early': 'orange',
-        'lefttransfer-late': 'orange'
-    }
-    cmap = list(epoch_color_map.values())
+    cmap = list(EPOCH_COLORS.values())
     fig, ax = plt.subplots(figsize=(3, 3))
-    data = ecc.groupby(['sub', 'epoch']).mean(numeric_only=True).reset_index()
-    epoch_order = list(epoch_color_map.keys())
-    data['epoch'] = pd.Categorical(data['epoch'], categories=epoch_order, ordered=True)
-    data.sort_values('epoch', inplace=True)
-    data.reset_index(drop=True, inplace=True)
+    data = ecc.groupby(['sub', 'epoch'], as_index=False)['distance'].mean()
+    data = data.astype({'epoch': EPOCH_DTYPE}).sort_values('epoch', ignore_index=True)
     sns.lineplot(data=data, x='epoch', y='distance', errorbar=None, 
                  marker='o', ms=6, lw=1.2, mfc='w', mec='k', color='k', ax=ax)
     sns.stripplot(data=data, x='epoch', y='distance', jitter=.1, 
@@ -56,22 +47,19 @@ def plot_sig_region_eccentricity(ecc, fig_name='S3_task_epoch-hand_effect_sig_re
 
     ticks = [0, 1, 2, 3, 4, 5]
     ax.set_xticks(ticks)
-    
-    # Set the tick labels with rotation and fontsize
-    labels = ['LH Baseline', 'RH Baseline', 'RH Learning Early',
-              'RH Learning Late', 'LH Transfer Early', 'LH Transfer Late']
-    ax.set_xticklabels(labels, rotation=90, fontsize=14)
+    ax.set_xticklabels(EPOCH_LABELS, rotation=90, fontsize=14)
     ax.set_yticks(np.arange(1, 4).astype(int))
     ax.set_ylabel('Eccentricity', fontsize=14, fontweight='bold')
-    sns.despine()
+    sns.despine(ax=ax)
 
     fig.savefig(os.path.join(FIG_DIR, fig_name), dpi=300, bbox_inches='tight')
+    plt.close(fig)
 
-def main():
+def make_figures():
 
-    data = pd.read_excel(os.path.join(DATA_DIR, 'S3_data.xlsx'))
+    data = load_workbook('S3_data', sheet_name=0)
 
     plot_sig_region_eccentricity(data)
 
 if __name__ == '__main__':
-    main()
+    make_figures()
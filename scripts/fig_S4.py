@@ -10,7 +10,8 @@ This script:
 import os
 import sys
 import numpy as np
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -19,7 +20,8 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from utils.config import FIG_DIR, DATA_DIR
+from utils.config import FIG_DIR, load_workbook
+from utils.epochs import EPOCH_COLORS, EPOCH_LABELS, EPOCH_ORDER
 os.makedirs(FIG_DIR, exist_ok=True)
 
 def plot_sig_region_bold(data, ax):
@@ -38,32 +40,22 @@ def plot_sig_region_bold(data, ax):
     ax : matplotlib.axes.Axes
         The axes containing the plot.
     """
-    epoch_color_map = {
-        'leftbaseline': 'orange',
-        'rightbaseline': 'green',
-        'rightlearning-early': 'green',
-        'rightlearning-late': 'green',
-        'lefttransfer-early': 'orange',
-        'lefttransfer-late': 'orange'
-    }
-    labels = ['LH Baseline', 'RH Baseline', 'RH Learning Early',
-              'RH Learning Late', 'LH Transfer Early', 'LH Transfer Late']
-    cmap = list(epoch_color_map.values())
+    cmap = list(EPOCH_COLORS.values())
     sns.lineplot(data=data, x='epoch', y='tmean', errorbar=None, 
                  marker='o', ms=6, lw=1.2, mfc='w', mec='k', color='k', ax=ax)
     sns.stripplot(data=data, x='epoch', y='tmean', jitter=.1, 
               zorder=-1, s=5, alpha=.5, palette=cmap, hue='epoch', ax=ax)
     ax.set_xlabel('', fontsize=12, fontweight='bold')
     ax.set_ylabel('z-score', fontsize=12)
-    ax.set_xticks(range(len(epoch_color_map)))
-    ax.set_xticklabels(labels, rotation=90, fontsize=12)
+    ax.set_xticks(range(len(EPOCH_ORDER)))
+    ax.set_xticklabels(EPOCH_LABELS, rotation=90, fontsize=12)
     ax.set_yticks(np.arange(-.4, .5, .2))
-    sns.despine()
+    sns.despine(ax=ax)
     return ax
     
-def main():
+def make_figures():
 
-    data = pd.read_excel(os.path.join(DATA_DIR, 'S4_data.xlsx'), sheet_name=None)
+    data = load_workbook('S4_data')
     
     fig, axs = plt.subplots(1, 2, figsize=(6, 3))
     plot_sig_region_bold(data['hand_sig_regions_bold'], ax=axs[0])
@@ -73,6 +65,7 @@ def main():
     plt.subplots_adjust(wspace=0.5)
 
     fig.savefig(os.path.join(FIG_DIR, 'S4_average_bold_across_significant_regions.png'), dpi=300, bbox_inches='tight')
+    plt.close(fig)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    make_figures()
\ No newline at end of file
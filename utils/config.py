@@ -1,7 +1,189 @@
+import hashlib
 import os
+import tempfile
+
+import openpyxl
+import pandas as pd
+from pandas.io.parsers import TextParser
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
 FIG_DIR = os.path.join(PROJECT_ROOT, 'figures')
 RESOURCES_DIR = os.path.join(DATA_DIR, 'resources')
+CACHE_DIR = os.path.join(DATA_DIR, '.cache')
+
+# Processes that pairwise_stat_maps may use to render contrasts in parallel;
+# main.py lowers it so concurrently running scripts share the CPUs
+STAT_MAP_WORKERS = os.cpu_count() or 1
+
+# Plotted measures stored as float32, by (workbook, sheet); p- and q-values
+# are left as float64
+FLOAT32_COLUMNS = {
+    ('1B_data', 'binned_learning_curve'): {'AngularError'},
+    ('1B_data', 'rh_vs_lh_early_error'): {'AngularError'},
+    ('3E_data', 'evaluations'): {'Hand', 'Epoch', 'Learning', 'Time'},
+    ('4E_data', 'right_vs_left_eccentricity'): {'distance'},
+    ('5E_data', 'early_vs_baseline_eccentricity'): {'distance'},
+    ('5E_data', 'late_vs_early_eccentricity'): {'distance'},
+    ('6BD_data', 'hand_sig_regions_eccentricity'): {'distance'},
+    ('6BD_data', 'epoch_sig_regions_eccentricity'): {'distance'},
+    ('8_data', 'Left M1'): {'distance'},
+    ('8_data', 'Right M1'): {'distance'},
+    ('8_data', 'Left mPFC'): {'distance'},
+    ('8_data', 'Right mPFC'): {'distance'},
+    ('S3_data', 'S3_data'): {'distance'},
+    ('S4_data', 'hand_sig_regions_bold'): {'tmean'},
+    ('S4_data', 'task_epoch_sig_regions_bold'): {'tmean'},
+}
+
+# Spin-permutation sheets, whose null distribution columns (named by
+# permutation number) are stored as float32
+SPIN_SHEETS = {
+    ('S6B_data', 'lefttransfer-early_transfer_spi'),
+    ('S7BE_data', 'rightlearning-early_error_spins'),
+    ('S7BE_data', 'lefttransfer-early_error_spins'),
+}
+
+# Version of the cached file layout; the downcast rules above are part of the
+# cache key on their own (see _cache_key)
+_CACHE_FORMAT = 1
+
+def _cache_key():
+    """Key of the cache format and downcast rules, so that sheets cached under
+    other rules are never read back"""
+    rules = (_CACHE_FORMAT,
+             sorted((key, sorted(cols)) for key, cols in FLOAT32_COLUMNS.items()),
+             sorted(SPIN_SHEETS))
+    return hashlib.sha1(repr(rules).encode()).hexdigest()[:12]
+
+def _is_fresh(cache_file, path):
+    """Check that a cache file exists and is newer than its source workbook"""
+    return (os.path.exists(cache_file) and
+            os.path.getmtime(cache_file) > os.path.getmtime(path))
+
+def _read_excel_sheets(path, sheets):
+    """Parse the given sheets of a workbook with openpyxl's read-only reader"""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        data = {}
+        for sheet in sheets:
+            rows = [['' if v is None else v for v in row] for row in wb[sheet].values]
+            while rows and all(v == '' for v in rows[-1]):
+                rows.pop()
+            # same header/NA/boolean parsing that pd.read_excel applies
+            data[sheet] = (TextParser(rows, header=0).read() if rows
+                           else pd.DataFrame())
+    finally:
+        wb.close()
+    return data
+
+def _parquet_compatible(df):
+    """Use string column names and store mixed-type label columns as strings"""
+    df = df.set_axis(df.columns.map(str), axis=1)
+    for col in df.select_dtypes('object'):
+        if pd.api.types.infer_dtype(df[col]).startswith('mixed'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+def _downcast(df, name, sheet):
+    """Convert the sheet's float64 columns listed in FLOAT32_COLUMNS, and the
+    null distribution columns of SPIN_SHEETS, to float32"""
+    keep = FLOAT32_COLUMNS.get((name, sheet), set())
+    spins = (name, sheet) in SPIN_SHEETS
+    cols = [col for col in df.select_dtypes('float64')
+            if col in keep or (spins and col.isdigit())]
+    return df.astype({col: 'float32' for col in cols})
+
+def _replace_file(cache_file, write):
+    """Call `write` on a temporary file unique to this writer, then move it to
+    `cache_file`, so that readers only ever see a complete file"""
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_file)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+
+def _write_cached_sheet(df, cache_file):
+    """Write a sheet to Parquet, replacing any previous file only once complete"""
+    _replace_file(cache_file, lambda tmp_file: df.to_parquet(
+        tmp_file, engine='pyarrow', compression='zstd'))
+
+def _sheet_names(path, cache_dir):
+    """Get the workbook's sheet names in order, from the cached manifest if valid"""
+    manifest = os.path.join(cache_dir, 'sheets.txt')
+    if _is_fresh(manifest, path):
+        with open(manifest) as f:
+            return f.read().splitlines()
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    sheets = wb.sheetnames
+    wb.close()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    def write(tmp_file):
+        with open(tmp_file, 'w') as f:
+            f.write('\n'.join(sheets))
+
+    _replace_file(manifest, write)
+    return sheets
+
+def load_workbook(name, sheet_name=None):
+    """Load sheets of an Excel workbook in DATA_DIR, caching them as Parquet.
+
+    The first time a sheet of `name`.xlsx is requested, it is parsed and
+    written to CACHE_DIR/`name`/ as its own Parquet file. Later calls read
+    the Parquet file instead, unless the workbook has been modified since.
+    Only the requested sheets are parsed or read. Float columns of the
+    plotted measures (see FLOAT32_COLUMNS) and of spin-permutation null
+    distributions (see SPIN_SHEETS) are stored as float32; p- and q-values
+    stay float64. The cached files sit in a subdirectory named by a key of
+    these rules, so sheets cached under other rules are parsed again.
+
+    Parameters
+    ----------
+    name : str
+        Workbook file name without the .xlsx extension (e.g., '1B_data')
+    sheet_name : str, int, list or None, optional
+        Sheet(s) to return, following `pandas.read_excel`: a sheet name or
+        position returns a single DataFrame, a list returns a dict of the
+        requested sheets. By default None, which returns all sheets.
+
+    Returns
+    -------
+    pandas.DataFrame or dict
+        Requested sheet, or dictionary of sheet name to DataFrame
+    """
+    path = os.path.join(DATA_DIR, f'{name}.xlsx')
+    cache_dir = os.path.join(CACHE_DIR, name, _cache_key())
+    all_sheets = _sheet_names(path, cache_dir)
+
+    if sheet_name is None:
+        sheets = all_sheets
+    elif isinstance(sheet_name, list):
+        sheets = sheet_name
+    elif isinstance(sheet_name, int):
+        sheets = [all_sheets[sheet_name]]
+    else:
+        sheets = [sheet_name]
+
+    data, missing = {}, []
+    for sheet in sheets:
+        cache_file = os.path.join(cache_dir, f'{sheet}.parquet')
+        if _is_fresh(cache_file, path):
+            data[sheet] = pd.read_parquet(cache_file)
+        else:
+            missing.append(sheet)
+
+    if missing:
+        for sheet, df in _read_excel_sheets(path, missing).items():
+            data[sheet] = _downcast(_parquet_compatible(df), name, sheet)
+            _write_cached_sheet(data[sheet], os.path.join(cache_dir, f'{sheet}.parquet'))
+
+    if sheet_name is None or isinstance(sheet_name, list):
+        return {sheet: data[sheet] for sheet in sheets}
+    else:
+        return data[sheets[0]]
@@ -0,0 +1,15 @@
+import pandas as pd
+
+# Task epochs in chronological order, coloured by the hand used
+EPOCH_COLORS = {
+    'leftbaseline': 'orange',
+    'rightbaseline': 'green',
+    'rightlearning-early': 'green',
+    'rightlearning-late': 'green',
+    'lefttransfer-early': 'orange',
+    'lefttransfer-late': 'orange'
+}
+EPOCH_ORDER = list(EPOCH_COLORS)
+EPOCH_LABELS = ['LH Baseline', 'RH Baseline', 'RH Learning Early',
+                'RH Learning Late', 'LH Transfer Early', 'LH Transfer Late']
+EPOCH_DTYPE = pd.CategoricalDtype(EPOCH_ORDER, ordered=True)
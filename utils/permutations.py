@@ -0,0 +1,103 @@
+import os
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.patches import Rectangle
+import seaborn as sns
+
+from utils.config import FIG_DIR
+
+def _segments(x0, y0, x1, y1):
+    """Stack line segments from (x0, y0) to (x1, y1) into an (n, 2, 2) array"""
+    return np.stack([np.column_stack([x0, y0]), np.column_stack([x1, y1])], axis=1)
+
+def _prep_hemi(meta, nulls, p_thresh):
+    """Compute the plotted arrays of one hemisphere's networks"""
+    return {
+        'positions': np.arange(1, len(meta) + 1),
+        'labels': meta['network'].tolist(),
+        'rvals': meta['r'].to_numpy(),
+        'colors': np.where(meta['pspin_fdr'].to_numpy() <= p_thresh, 'red', 'blue'),
+        # whisker ends, quartiles and median of each null distribution
+        'stats': np.percentile(nulls, [0, 25, 50, 75, 100], axis=1),
+    }
+
+def _draw_hemi(ax, hemi):
+    """Draw one hemisphere's null distributions and real correlation values"""
+    xs = hemi['positions']
+    lo, q1, med, q3, hi = hemi['stats']
+
+    # Box plots for null distributions, whiskers spanning the full range,
+    # drawn as one collection each for boxes, whiskers/caps and medians
+    boxes = [Rectangle((x - .25, b), .5, t - b) for x, b, t in zip(xs, q1, q3)]
+    ax.add_collection(PatchCollection(
+        boxes, facecolor='lightblue', edgecolor='black', linewidth=1, zorder=2
+    ))
+    whiskers = np.concatenate([
+        _segments(xs, q1, xs, lo),
+        _segments(xs, q3, xs, hi),
+        _segments(xs - .125, lo, xs + .125, lo),
+        _segments(xs - .125, hi, xs + .125, hi),
+    ])
+    ax.add_collection(LineCollection(
+        whiskers, colors='black', linewidths=1, capstyle='projecting', zorder=2
+    ))
+    ax.add_collection(LineCollection(
+        _segments(xs - .25, med, xs + .25, med), colors='C1', linewidths=1,
+        capstyle='projecting', zorder=2.1
+    ))
+    ax.set_xlim(.5, len(xs) + .5)
+
+    # Overlay real correlation values as points
+    ax.scatter(xs, hemi['rvals'], c=hemi['colors'], s=36, linewidths=1, zorder=5)
+
+    ax.axhline(0, color='blue', linestyle='dashed', zorder=-1)
+    ax.grid(True, axis='x', linestyle='--', alpha=0.5)
+    ax.set_xticks(
+        xs,
+        labels=hemi['labels'],
+        rotation=90,
+        ha='center',
+        fontsize=12
+    )
+    ax.tick_params(axis='x', which='both', bottom=False, top=False)
+    ax.set(ylim=(-0.45, 0.45))
+    sns.despine(ax=ax, bottom=True)
+
+def plot_permute_bplots(data, fig_name, n_perm=1000, p_thresh=0.05):
+    """
+    Plot permutation null distributions and real correlation values for each hemisphere.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Must include columns ['hemi', 'network', 'r', 'pspin_fdr'] and
+        null distribution columns as last `n_perm` columns.
+    fig_name : str
+        Full name for saving the figure.
+    n_perm : int, optional
+        Number of permutations (default=1000).
+    p_thresh : float, optional
+        Significance threshold for coloring real data points (default=0.05).
+    """
+    # keep only the columns used, with the null distributions as one array
+    meta = data[['hemi', 'network', 'r', 'pspin_fdr']]
+    nulls = data.iloc[:, -n_perm:].to_numpy()
+    # plotted arrays of each hemisphere, with its rows found in one pass
+    hemis = {
+        hemi: _prep_hemi(meta.iloc[rows], nulls[rows], p_thresh)
+        for hemi, rows in meta.groupby('hemi', sort=False).indices.items()
+    }
+
+    fig, axs = plt.subplots(1, 2, figsize=(12, 5))
+    for ax, hemi in zip(axs, ['LH', 'RH']):
+        _draw_hemi(ax, hemis[hemi])
+    axs[0].set_ylabel('Spatial Correlation', fontsize=14)
+    axs[0].set_title('Left Hemisphere', fontsize=14)
+    axs[1].set_title('Right Hemisphere', fontsize=14)
+    fig.tight_layout()
+    
+    fig.savefig(os.path.join(FIG_DIR, fig_name), dpi=300, pil_kwargs={'compress_level': 1})
+    plt.close(fig)
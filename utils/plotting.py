@@ -1,6 +1,11 @@
-import os, glob
+import os, fnmatch, copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import natsort
 import nibabel as nib
@@ -10,17 +15,21 @@ from brainspace.mesh.mesh_io import read_surface
 from surfplot import Plot
 from surfplot.utils import add_fslr_medial_wall
 
+from utils import config
 from utils.config import *
 
 plt.rcParams['font.family'] = ['Arial']
 plt.rcParams["savefig.format"] = 'png'
 plt.rcParams["savefig.dpi"] = 300
+plt.rcParams['figure.max_open_warning'] = 0
 
 atlas_file = os.path.join(RESOURCES_DIR, 'Schaefer2018_400Parcels_17Networks_order.dlabel.nii')
 
+_natsort_key = natsort.natsort_keygen()
+
 def get_files(pattern, force_list=False):
     """Extracts files in alphanumerical order that match the provided glob 
-    pattern.
+    pattern. Only the file name part of the pattern may contain wildcards.
 
     Parameters
     ----------
@@ -41,7 +50,12 @@ def get_files(pattern, force_list=False):
     FileNotFoundError
         No files were detected using the input pattern.
     """
-    files = natsort.natsorted(glob.glob(pattern))
+    # match file names within the pattern's (literal) directory
+    dirname, basename = os.path.split(pattern)
+    with os.scandir(dirname or '.') as entries:
+        files = [os.path.join(dirname, e.name) for e in entries
+                 if fnmatch.fnmatch(e.name, basename)]
+    files.sort(key=_natsort_key)
     if not files:
         raise FileNotFoundError('Pattern could not detect file(s)')
 
@@ -49,13 +63,26 @@ def get_files(pattern, force_list=False):
         return files[0] 
     else:
         return files
+
+@lru_cache(maxsize=None)
+def _atlas_vertices():
+    """Load the vertex labels of `atlas_file` once per session, as integers"""
+    return np.asarray(nib.load(atlas_file).dataobj).ravel().astype(np.int32)
+
 def _align_labels_to_atlas(x, source_labels, target_labels):
     """Match labels to corresponding vertex labels"""
 
     target = np.unique(target_labels)[1:]
-    df1 = pd.DataFrame(target, index=target)
-    df2 = pd.DataFrame(x, index=source_labels)
-    return pd.concat([df1, df2], axis=1).iloc[:, 1:].values
+    x = np.asarray(x, dtype=float)
+    x = x.reshape(len(x), -1)
+    source_labels = np.asarray(source_labels)
+
+    # rows of x whose label is in the atlas, and the atlas row of each
+    idx = np.searchsorted(target, source_labels)
+    found = target[np.clip(idx, 0, target.size - 1)] == source_labels
+    aligned = np.full((target.size, x.shape[1]), np.nan)
+    aligned[idx[found]] = x[found]
+    return aligned
 
 
 def weights_to_vertices(data, target, labels=None):
@@ -83,9 +110,12 @@ def weights_to_vertices(data, target, labels=None):
     Returns
     -------
     numpy.ndarray
-        Array of mapped vertices
+        Array of mapped vertices, of shape (n_features, n_vertices) if `data`
+        has more than one feature
     """
-    if isinstance(target, str): 
+    if isinstance(target, str) and target == atlas_file:
+        vertices = _atlas_vertices()
+    elif isinstance(target, str): 
         vertices = nib.load(target).get_fdata().ravel()
     else:
         vertices = target.ravel()
@@ -99,12 +129,16 @@ def weights_to_vertices(data, target, labels=None):
     if (len(data.shape) == 1) or (data.shape[1] == 1):
         weights = map_to_labels(data.ravel(),  **map_args)
     else:
-        weights = [map_to_labels(x, **map_args) for x in data.T]
+        # one row of vertices per feature, mapped in a single call
+        weights = map_to_labels(data.T, **map_args)
     return weights
 
+@lru_cache(maxsize=None)
 def get_surfaces(style='inflated', load=True):
     """Fetch surface files of a given surface style
 
+    Results are cached, so loaded surfaces are shared between calls.
+
     Parameters
     ----------
     style : str, optional
@@ -124,6 +158,7 @@ def get_surfaces(style='inflated', load=True):
     else:
         return surfaces
 
+@lru_cache(maxsize=None)
 def get_sulc():
     """Get sulcal depth map for plotting style"""
     img = os.path.join(RESOURCES_DIR, 'S1200.sulc_MSMAll.32k_fs_LR.dscalar.nii')
@@ -138,8 +173,52 @@ def epoch_order():
              'left': 1, 'right': 2}
 
 
+def _copy_plot(template):
+    """Copy a surfplot Plot so that layers can be added without changing it"""
+    p = copy.copy(template)
+    for attr in ['layers', 'cmaps', 'color_ranges', '_show_cbar', 'cbar_labels']:
+        setattr(p, attr, list(getattr(template, attr)))
+    return p
+
+
+# Plot settings of each surface view drawn by pairwise_stat_maps, and the 
+# suffix added to its file name
+STAT_MAP_VIEWS = {
+    'row': (dict(layout='row', mirror_views=True, size=(800, 200), zoom=1.2), ''),
+    'dorsal': (dict(views='dorsal', size=(150, 200), zoom=3.3), '_dorsal'),
+    'posterior': (dict(views='posterior', size=(150, 200), zoom=3.3), '_posterior'),
+}
+
+@lru_cache(maxsize=None)
+def _view_template(view):
+    """Plot of a view with the sulcal depth layer, set up once per process"""
+    surfaces = get_surfaces()
+    plot_params, _ = STAT_MAP_VIEWS[view]
+    p = Plot(surfaces['lh'], surfaces['rh'], **plot_params)
+    p.add_layer(data=get_sulc(), cmap='gray', cbar=False)
+    return p
+
+
+def _render_contrast(x, fname, views, layer_params, dpi=None):
+    """Save the stat map `x` of one contrast in each of the given views"""
+    outline_params = dict(cbar=False, cmap='binary', as_outline=True)
+    # outline of the regions with a (non-zero) stat value
+    outline = np.where(np.isnan(x) | (x == 0), 0., 1.)
+
+    for view in views:
+        p = _copy_plot(_view_template(view))
+        p.add_layer(x, **layer_params)
+        p.add_layer(outline, **outline_params)
+        # only the row view has a colour bar
+        fig = p.build(colorbar=(view == 'row'))
+        fig.savefig(fname + STAT_MAP_VIEWS[view][1], dpi=dpi,
+                    pil_kwargs={'compress_level': 1})
+        plt.close(fig)
+
+
 def pairwise_stat_maps(data, prefix, layercbar=False, dorsal=True, posterior=True, vmax='auto', 
-                       vmin='auto', cbar_orientation='vertical', thresholded=True):
+                       vmin='auto', cbar_orientation='vertical', thresholded=True, dpi=None, 
+                       max_workers=None):
     """Plot pairwise comparisons t-maps on brain surfaces
 
     Parameters
@@ -159,11 +238,12 @@ def pairwise_stat_maps(data, prefix, layercbar=False, dorsal=True, posterior=Tru
     cbar_orientation : str, optional
         Colour bar orientation, either 'vertical' or 'horizontal', 
         by default 'vertical'
-
-    Returns
-    -------
-    matplotlib.figure.Figure
-        Stat maps
+    dpi : float, optional
+        Resolution of the saved figures, e.g. lower for quick drafts. By 
+        default None, which uses savefig.dpi (300)
+    max_workers : int, optional
+        Maximum number of processes rendering contrasts in parallel. By 
+        default None, which uses utils.config.STAT_MAP_WORKERS
     """
     pairwise_contrasts = data.groupby(['A', 'B'])
     list_ = []
@@ -190,42 +270,31 @@ def pairwise_stat_maps(data, prefix, layercbar=False, dorsal=True, posterior=Tru
     
     cmap = cmr.get_sub_cmap('RdBu_r', .05, .95)
 
-    surfaces = get_surfaces()
-    sulc = get_sulc()
-
-    sulc_params = dict(data=sulc, cmap='gray', cbar=False)
     layer_params = dict(cmap=cmap, cbar=layercbar, color_range=(-vmax, vmax))
-    outline_params = dict(cbar=False, cmap='binary', as_outline=True)
+    views = ['row'] + ['dorsal'] * dorsal + ['posterior'] * posterior
 
-    for i in tvals.columns:
+    # vertex maps of all contrasts at once, one row per contrast
+    vertex_tvals = np.atleast_2d(weights_to_vertices(tvals.to_numpy(), atlas_file, 
+                                                     tvals.index.values))
+    jobs = []
+    for i, x in zip(tvals.columns, vertex_tvals):
         contrast = i[:-2].replace('_', '_vs_')
-        x = weights_to_vertices(tvals[i], atlas_file, 
-                                           tvals.index.values)
-        # row 
-        p = Plot(surfaces['lh'], surfaces['rh'], layout='row', 
-                 mirror_views=True, size=(800, 200), zoom=1.2)
-        p.add_layer(**sulc_params)
-        p.add_layer(x, **layer_params)
-        p.add_layer((np.nan_to_num(x) != 0).astype(float), **outline_params)
-        fig = p.build()
-        fig.savefig(prefix + contrast)
-
-        if dorsal:
-            p = Plot(surfaces['lh'], surfaces['rh'], views='dorsal', 
-                    size=(150, 200), zoom=3.3)
-            p.add_layer(**sulc_params)
-            p.add_layer(x, **layer_params)
-            p.add_layer((np.nan_to_num(x) != 0).astype(float), **outline_params)
-            fig = p.build(colorbar=False)
-            fig.savefig(prefix + contrast + '_dorsal')
-
-        if posterior:
-            p = Plot(surfaces['lh'], surfaces['rh'], views='posterior', 
-                    size=(150, 200), zoom=3.3)
-            p.add_layer(**sulc_params)
-            p.add_layer(x, **layer_params)
-            p.add_layer((np.nan_to_num(x) != 0).astype(float), **outline_params)
-            fig = p.build(colorbar=False)
-            fig.savefig(prefix + contrast + '_posterior')
-
-    return fig
+        jobs.append((x, prefix + contrast, views, layer_params, dpi))
+
+    if max_workers is None:
+        max_workers = config.STAT_MAP_WORKERS
+    n_workers = min(len(jobs), max_workers)
+    if n_workers <= 1:
+        for job in jobs:
+            _render_contrast(*job)
+        return
+
+    # contrasts are independent, so they are rendered in parallel, each 
+    # worker loading the surfaces once
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('forkserver')
+    else:
+        ctx = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx) as executor:
+        # consume the results so that any worker error is raised here
+        list(executor.map(_render_contrast, *zip(*jobs)))